@@ -6,21 +6,32 @@ import json
 import re
 import sys
 
-# Debugging trigger patterns
+# Trigger words and phrases are matched as whole words (like regex \b...\b)
+# with a plain substring scan of the lowercased prompt; only triggers that
+# need wildcards stay as regex patterns
+
+# Debugging triggers
+DEBUG_KEYWORDS = (
+    "debug", "debugging", "bug",
+    "not working",
+    "stack trace", "error message", "exception", "^^^",
+)
 DEBUG_PATTERNS = [
-    r'\b(debug|debugging|bug)\b',
-    r'\b(why.*not work|what.*wrong|not working)\b',
-    r'\b(stack trace|error message|exception|\^\^\^)\b'
+    r'\b(why.*not work|what.*wrong)\b',
 ]
 
-# Investigation trigger patterns  
+# Investigation triggers
+INVESTIGATION_KEYWORDS = (
+    "investigate", "research", "analyze", "examine", "explore", "understand",
+    "figure out", "explain", "find out",
+    "code review", "audit", "inspect",
+)
 INVESTIGATION_PATTERNS = [
-    r'\b(investigate|research|analyze|examine|explore|understand)\b',
-    r'\b(how does.*work|figure out|explain|find out)\b',
-    r'\b(code review|audit|inspect)\b'
+    r'\b(how does.*work)\b',
 ]
 
-# Prompt improvement trigger patterns
+# Prompt improvement triggers
+PROMPT_IMPROVEMENT_KEYWORDS = ()
 PROMPT_IMPROVEMENT_PATTERNS = [
     r'\b(improv|enhanc).*\b(prompt|prompting)\b',
     r'\b(prompt|prompting).*\b(improv|enhanc)\b',
@@ -28,6 +39,15 @@ PROMPT_IMPROVEMENT_PATTERNS = [
     r'\b(prompt|prompting).*\b(better|optimize|refine)\b'
 ]
 
+# Every trigger above contains one of these lowercase substrings: the keywords
+# themselves plus a literal from each regex pattern. A prompt containing none
+# of them cannot match anything, so the hook can exit before any scanning
+LITERAL_TRIGGERS = DEBUG_KEYWORDS + INVESTIGATION_KEYWORDS + PROMPT_IMPROVEMENT_KEYWORDS + (
+    "why", "what",  # DEBUG_PATTERNS
+    "how does",     # INVESTIGATION_PATTERNS
+    "prompt",       # PROMPT_IMPROVEMENT_PATTERNS
+)
+
 DEBUG_PROMPT = """
 <system-reminder>The user has mentioned a key word or phrase that triggers this reminder. 
 
@@ -82,33 +102,84 @@ If the user is not looking to improve a prompt, or you have already read the gui
 </system-reminder>
 """
 
-def check_patterns(text, patterns):
-    """Check if any pattern matches the text (case insensitive)."""
-    for pattern in patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
+def compile_patterns(patterns):
+    """Fuse a category's patterns into one case-insensitive alternation."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+def is_word_char(c):
+    """Match the regex notion of a \\w character."""
+    return c.isalnum() or c == "_"
+
+def at_word_boundary(text, i):
+    """Check for a regex \\b at index i of text."""
+    before = i > 0 and is_word_char(text[i - 1])
+    after = i < len(text) and is_word_char(text[i])
+    return before != after
+
+def keyword_pattern(keywords):
+    """Express keywords as the equivalent \\b-guarded regex alternation."""
+    return r'\b(' + "|".join(re.escape(k) for k in keywords) + r')\b'
+
+def has_keyword(text_lower, keywords):
+    """Check if any keyword occurs in the lowercased ASCII text as a whole word."""
+    for keyword in keywords:
+        start = text_lower.find(keyword)
+        while start != -1:
+            if at_word_boundary(text_lower, start) and at_word_boundary(text_lower, start + len(keyword)):
+                return True
+            start = text_lower.find(keyword, start + 1)
     return False
 
+def check_patterns(text, text_lower, keywords, patterns):
+    """Check the category's keywords, then its fused regex, against the text.
+
+    The regex is only compiled when this category's keywords miss. Categories
+    are checked in order, so a prompt whose only hit is a later category's
+    keyword still compiles the earlier categories' regexes.
+    """
+    if text.isascii():
+        if has_keyword(text_lower, keywords):
+            return True
+    elif keywords:
+        # Outside ASCII, lower() can change length or fold differently from
+        # re.IGNORECASE ('İ'.lower() is 'i' plus a combining dot), so let the
+        # regex engine match the keywords against the original text
+        patterns = [keyword_pattern(keywords)] + patterns
+    return compile_patterns(patterns).search(text) is not None
+
 try:
-    input_data = json.load(sys.stdin)
-except json.JSONDecodeError as e:
+    # One read of the raw bytes; json.loads detects the encoding itself, which
+    # skips the chunked text-decoding path json.load(sys.stdin) goes through
+    input_data = json.loads(sys.stdin.buffer.read())
+except (json.JSONDecodeError, UnicodeDecodeError) as e:
     print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
     sys.exit(1)
 
 prompt = input_data.get("prompt", "")
 
+# Nothing to scan
+if not prompt:
+    sys.exit(0)
+
+prompt_lower = prompt.lower()
+
+# Fast path: no trigger substring anywhere, nothing to add. Only safe for
+# ASCII, where lower() agrees with re.IGNORECASE ('ſ' matches 's' there)
+if prompt.isascii() and not any(trigger in prompt_lower for trigger in LITERAL_TRIGGERS):
+    sys.exit(0)
+
 # Check for debugging triggers
-if check_patterns(prompt, DEBUG_PATTERNS):
+if check_patterns(prompt, prompt_lower, DEBUG_KEYWORDS, DEBUG_PATTERNS):
     print(DEBUG_PROMPT)
     sys.exit(0)
 
 # Check for investigation triggers  
-if check_patterns(prompt, INVESTIGATION_PATTERNS):
+if check_patterns(prompt, prompt_lower, INVESTIGATION_KEYWORDS, INVESTIGATION_PATTERNS):
     print(INVESTIGATION_PROMPT)
     sys.exit(0)
 
 # Check for prompt improvement triggers
-if check_patterns(prompt, PROMPT_IMPROVEMENT_PATTERNS):
+if check_patterns(prompt, prompt_lower, PROMPT_IMPROVEMENT_KEYWORDS, PROMPT_IMPROVEMENT_PATTERNS):
     print(PROMPT_IMPROVEMENT_PROMPT)
     sys.exit(0)
 
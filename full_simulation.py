@@ -1,142 +1,343 @@
 import math
+import sys
 
-# Mulberry32 PRNG
-class SeededRandom:
-    def __init__(self, seed):
-        self.seed = seed & 0xFFFFFFFF
-    
-    def next(self):
-        t = (self.seed + 0x6D2B79F5) & 0xFFFFFFFF
-        self.seed = t
-        t = ((t ^ (t >> 15)) * (t | 1)) & 0xFFFFFFFF
-        t = (t ^ (t + ((t ^ (t >> 7)) * (t | 61)) & 0xFFFFFFFF)) & 0xFFFFFFFF
-        return ((t ^ (t >> 14)) >> 0) / 4294967296
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Without numba the kernel runs as plain Python on the same arrays
+    def njit(**kwargs):
+        return lambda fn: fn
 
 # Configuration
-rng = SeededRandom(12345)
+seed = 12345
 minDistance = 5
 maxAttempts = 50
 gridWidth = 72
 gridHeight = 48
-cellSize = minDistance / math.sqrt(2)
-gridCols = math.ceil(gridWidth / cellSize)
-gridRows = math.ceil(gridHeight / cellSize)
+targetCount = 15
+maxIterations = 21  # Limit output
+verbose = True  # per-iteration trace; turn off for benchmarking
+sampler = "bridson"  # or "jones" for large targetCount (no per-iteration trace)
+trigTable = False  # quantized sin/cos lookup; faster, but no longer matches poissonDisc.js
+swapRemove = False  # O(1) active-list removal; reorders picks, so no longer matches poissonDisc.js
 
 # Exclusion zone
 excludedZones = [{"x": 36, "y": 24, "radius": 1}]
 
-# Grid
-grid = [[None for _ in range(gridCols)] for _ in range(gridRows)]
+# Trace record layout, one row per iteration
+TRACE_ACTIVE = 0     # active list size before selection
+TRACE_POINTS = 1     # points placed before this iteration
+TRACE_SELECTED = 2   # pts row of the selected point
+TRACE_ATTEMPT = 3    # attempt index that succeeded, -1 if none did
+TRACE_BOUNDS = 4     # rejections by reason...
+TRACE_EXCLUDED = 5
+TRACE_NEARBY = 6
+TRACE_FIELDS = 7
+
+# Mulberry32 PRNG as a pure function of a uint32 state held in a plain int
+MULBERRY32_STEP = 0x6D2B79F5
+
+@njit(cache=True)
+def mulberry32(state):
+    state = (state + MULBERRY32_STEP) & 0xFFFFFFFF
+    t = ((state ^ (state >> 15)) * (state | 1)) & 0xFFFFFFFF
+    t = (t ^ (t + ((t ^ (t >> 7)) * (t | 61)) & 0xFFFFFFFF)) & 0xFFFFFFFF
+    return state, ((t ^ (t >> 14)) & 0xFFFFFFFF) * (1.0 / 4294967296.0)
 
-def isInExcludedZone(point):
-    for zone in excludedZones:
-        distance = math.sqrt((point["x"] - zone["x"])**2 + (point["y"] - zone["y"])**2)
-        if distance < zone["radius"]:
+# The state only ever advances by MULBERRY32_STEP, so the next n draws can be
+# computed side by side; the values match n sequential mulberry32 calls.
+# uint32 arrays wrap mod 2**32 on their own, so no masking is needed here
+# (scalars still need it: NumPy scalars warn on overflow and numba widens them)
+@njit(cache=True)
+def mulberry32_batch(state, n):
+    s = np.uint32(state) + np.arange(1, n + 1).astype(np.uint32) * np.uint32(MULBERRY32_STEP)
+    t = (s ^ (s >> np.uint32(15))) * (s | np.uint32(1))
+    t = t ^ (t + (t ^ (t >> np.uint32(7))) * (t | np.uint32(61)))
+    u = (t ^ (t >> np.uint32(14))).astype(np.float64) * (1.0 / 4294967296.0)
+    return (state + n * MULBERRY32_STEP) & 0xFFFFFFFF, u
+
+@njit(cache=True)
+def isInExcludedZone(x, y, excl_x, excl_y, excl_r2):
+    for z in range(excl_x.shape[0]):
+        dx = x - excl_x[z]
+        dy = y - excl_y[z]
+        if dx * dx + dy * dy < excl_r2[z]:
             return True
     return False
 
-def insertIntoGrid(point):
-    gridX = int(point["x"] / cellSize)
-    gridY = int(point["y"] / cellSize)
-    if 0 <= gridY < gridRows and 0 <= gridX < gridCols:
-        grid[gridY][gridX] = point
-
-def hasNearbyPoints(point):
-    gridX = int(point["x"] / cellSize)
-    gridY = int(point["y"] / cellSize)
-    
-    for dy in range(-2, 3):
-        for dx in range(-2, 3):
-            checkX = gridX + dx
-            checkY = gridY + dy
-            
-            if (0 <= checkY < gridRows and 0 <= checkX < gridCols and 
-                grid[checkY][checkX] is not None):
-                existingPoint = grid[checkY][checkX]
-                distance = math.sqrt(
-                    (point["x"] - existingPoint["x"])**2 +
-                    (point["y"] - existingPoint["y"])**2
-                )
-                
-                if distance < minDistance:
+# Candidate directions quantized to TRIG_TABLE_SIZE angles, looked up by
+# int(u * TRIG_TABLE_SIZE) instead of calling cos/sin per attempt
+TRIG_TABLE_SIZE = 1024
+TRIG_COS = np.cos(np.linspace(0, 2 * np.pi, TRIG_TABLE_SIZE, endpoint=False))
+TRIG_SIN = np.sin(np.linspace(0, 2 * np.pi, TRIG_TABLE_SIZE, endpoint=False))
+
+# Cell offsets (dy, dx) that can hold a point closer than minDistance. With
+# cellSize = minDistance / sqrt(2) the four (+-2, +-2) corners of the 5x5 window
+# are always more than minDistance away, so only these 21 cells are scanned
+NEIGHBOR_OFFSETS = np.array(
+    [(dy, dx) for dy in range(-2, 3) for dx in range(-2, 3)
+     if not (abs(dy) == 2 and abs(dx) == 2)],
+    dtype=np.int32,
+)
+
+@njit(cache=True)
+def hasNearbyPoints(x, y, pts, grid_idx, gridCols, gridRows, cellSize, minDistanceSq):
+    gridX = int(x / cellSize)
+    gridY = int(y / cellSize)
+
+    for k in range(NEIGHBOR_OFFSETS.shape[0]):
+        checkY = gridY + NEIGHBOR_OFFSETS[k, 0]
+        checkX = gridX + NEIGHBOR_OFFSETS[k, 1]
+        if 0 <= checkY < gridRows and 0 <= checkX < gridCols:
+            q = grid_idx[checkY * gridCols + checkX]
+            if q >= 0:
+                # Integer tile coordinates, so the squared distance is exact
+                dx = int(pts[q, 0]) - x
+                dy = int(pts[q, 1]) - y
+                if dx * dx + dy * dy < minDistanceSq:
                     return True
     return False
 
-def isInBounds(point):
-    return 0 <= point["x"] < gridWidth and 0 <= point["y"] < gridHeight
-
-# Find initial point
-initial = None
-for _ in range(1000):
-    candidate = {
-        "x": int(rng.next() * gridWidth),
-        "y": int(rng.next() * gridHeight)
-    }
-    if not isInExcludedZone(candidate):
-        initial = candidate
-        break
-
-print(f"Initial point: ({initial['x']}, {initial['y']})")
-print()
-
-points = [initial]
-activeList = [initial]
-insertIntoGrid(initial)
-
-# Main loop
-iteration = 0
-while len(activeList) > 0 and len(points) < 15:
-    iteration += 1
-    randomIndex = int(rng.next() * len(activeList))
-    point = activeList[randomIndex]
-    found = False
-    
-    print(f"=== Iteration {iteration} ===")
-    print(f"Active list size: {len(activeList)}, Points: {len(points)}")
-    print(f"Selected point: ({point['x']}, {point['y']})")
-    
-    # Try to place new point
-    rejection_reasons = {"bounds": 0, "excluded": 0, "nearby": 0}
-    
-    for i in range(maxAttempts):
-        angle = rng.next() * math.pi * 2
-        radius = minDistance * (1 + rng.next())
-        
-        candidate = {
-            "x": round(point["x"] + radius * math.cos(angle)),
-            "y": round(point["y"] + radius * math.sin(angle))
-        }
-        
-        # Track rejection reasons
-        if not isInBounds(candidate):
-            rejection_reasons["bounds"] += 1
-            continue
-        if isInExcludedZone(candidate):
-            rejection_reasons["excluded"] += 1
+# Grid size, spacing and attempt count are fixed for a run, so run_bridson is
+# built per configuration with them as closure variables; numba compiles those
+# as constants, folding the bounds checks and cell-index divisions
+def make_bridson_kernel(width, height, min_dist, max_attempts):
+    cellSize = min_dist / math.sqrt(2)
+    gridCols = math.ceil(width / cellSize)
+    gridRows = math.ceil(height / cellSize)
+    minDistanceSq = min_dist * min_dist
+
+    @njit(cache=True)
+    def run_bridson(seed, max_pts, excl_x, excl_y, excl_r2, max_iter, use_trig_table,
+                    use_swap_remove):
+        state = seed & 0xFFFFFFFF
+
+        # Grid: flat row-major cells holding the pts row of their occupant, -1 if empty
+        grid_idx = np.full(gridRows * gridCols, -1, dtype=np.int32)
+
+        # Point storage: packed (x, y) tile rows plus a fill counter. Candidates are
+        # rounded to whole tiles, so int16 holds them exactly (domains up to 32767)
+        pts = np.empty((max_pts, 2), dtype=np.int16)
+        n_pts = 0
+
+        # Active list holds row indices into pts
+        active = np.empty(max_pts, dtype=np.int32)
+        n_active = 0
+
+        trace = np.zeros((max_iter, TRACE_FIELDS), dtype=np.int32)
+
+        # Find initial point
+        for _ in range(1000):
+            state, u = mulberry32(state)
+            x = int(u * width)
+            state, u = mulberry32(state)
+            y = int(u * height)
+            if not isInExcludedZone(x, y, excl_x, excl_y, excl_r2):
+                pts[0, 0] = x
+                pts[0, 1] = y
+                active[0] = 0
+                n_pts = 1
+                n_active = 1
+                grid_idx[int(y / cellSize) * gridCols + int(x / cellSize)] = 0
+                break
+
+        # Main loop
+        iteration = 0
+        while n_active > 0 and n_pts < max_pts and iteration < max_iter:
+            state, u = mulberry32(state)
+            randomIndex = int(u * n_active)
+            sel = active[randomIndex]
+            px = float(pts[sel, 0])
+            py = float(pts[sel, 1])
+
+            rec = trace[iteration]
+            rec[TRACE_ACTIVE] = n_active
+            rec[TRACE_POINTS] = n_pts
+            rec[TRACE_SELECTED] = sel
+            rec[TRACE_ATTEMPT] = -1
+            iteration += 1
+
+            # Roll every attempt's (angle, radius) pair up front and place all
+            # candidates at once; draws are interleaved exactly as the scalar loop
+            # consumed them, so the state can be rewound to the accepted attempt
+            start = state
+            state, u = mulberry32_batch(start, 2 * max_attempts)
+            radii = min_dist * (1 + u[1::2])
+            if use_trig_table:
+                k = (u[0::2] * TRIG_TABLE_SIZE).astype(np.int64) & (TRIG_TABLE_SIZE - 1)
+                cos_a = TRIG_COS[k]
+                sin_a = TRIG_SIN[k]
+            else:
+                angles = u[0::2] * math.pi * 2
+                cos_a = np.cos(angles)
+                sin_a = np.sin(angles)
+            cand_x = np.round(px + radii * cos_a)
+            cand_y = np.round(py + radii * sin_a)
+
+            in_bounds = (cand_x >= 0) & (cand_x < width) & (cand_y >= 0) & (cand_y < height)
+            excluded = np.zeros(max_attempts, dtype=np.bool_)
+            for z in range(excl_x.shape[0]):
+                ex = cand_x - excl_x[z]
+                ey = cand_y - excl_y[z]
+                excluded |= ex * ex + ey * ey < excl_r2[z]
+
+            # Scan candidates in order; acceptance ends the scan
+            for i in range(max_attempts):
+                cx = int(cand_x[i])
+                cy = int(cand_y[i])
+
+                if not in_bounds[i]:
+                    rec[TRACE_BOUNDS] += 1
+                    continue
+                if excluded[i]:
+                    rec[TRACE_EXCLUDED] += 1
+                    continue
+
+                if hasNearbyPoints(cx, cy, pts, grid_idx, gridCols, gridRows, cellSize, minDistanceSq):
+                    rec[TRACE_NEARBY] += 1
+                    continue
+
+                # Found valid candidate
+                pts[n_pts, 0] = cx
+                pts[n_pts, 1] = cy
+                grid_idx[int(cy / cellSize) * gridCols + int(cx / cellSize)] = n_pts
+                active[n_active] = n_pts
+                n_pts += 1
+                n_active += 1
+                rec[TRACE_ATTEMPT] = i
+                state = (start + 2 * (i + 1) * MULBERRY32_STEP) & 0xFFFFFFFF
+                break
+
+            if rec[TRACE_ATTEMPT] < 0:
+                if use_swap_remove:
+                    # Order is irrelevant to Bridson, so fill the hole with the last entry
+                    active[randomIndex] = active[n_active - 1]
+                else:
+                    # Shift the tail down, keeping order (matches splice in poissonDisc.js)
+                    active[randomIndex:n_active - 1] = active[randomIndex + 1:n_active].copy()
+                n_active -= 1
+
+        return pts[:n_pts], trace[:iteration]
+
+    return run_bridson
+
+# Jones-style bucketed sampler: keep the grid cells that could still take a
+# point, throw darts into a random open cell, and close cells that get filled,
+# fully covered by a new point's disk, or miss max_attempts times. Every step
+# is O(1) (one dart, one fixed-size neighbor window), so the run is O(N)
+@njit(cache=True)
+def run_jones(seed, width, height, min_dist, max_pts, max_attempts,
+              excl_x, excl_y, excl_r2):
+    state = seed & 0xFFFFFFFF
+
+    cellSize = min_dist / math.sqrt(2)
+    gridCols = math.ceil(width / cellSize)
+    gridRows = math.ceil(height / cellSize)
+    minDistanceSq = min_dist * min_dist
+    n_cells = gridRows * gridCols
+
+    grid_idx = np.full(n_cells, -1, dtype=np.int32)
+    pts = np.empty((max_pts, 2), dtype=np.int16)
+    n_pts = 0
+
+    # Open cells as a bag of cell indices; closed cells are dropped lazily when drawn
+    open_cells = np.arange(n_cells).astype(np.int32)
+    n_open = n_cells
+    closed = np.zeros(n_cells, dtype=np.bool_)
+    misses = np.zeros(n_cells, dtype=np.int32)
+
+    while n_open > 0 and n_pts < max_pts:
+        state, u = mulberry32(state)
+        slot = int(u * n_open)
+        cell = open_cells[slot]
+        if closed[cell]:
+            open_cells[slot] = open_cells[n_open - 1]
+            n_open -= 1
             continue
-        if hasNearbyPoints(candidate):
-            rejection_reasons["nearby"] += 1
+
+        # Dart uniformly inside the cell, snapped to the tile it lands on
+        row = cell // gridCols
+        col = cell - row * gridCols
+        state, u = mulberry32(state)
+        x = int((col + u) * cellSize)
+        state, u = mulberry32(state)
+        y = int((row + u) * cellSize)
+
+        if (not (0 <= x < width and 0 <= y < height)
+                or isInExcludedZone(x, y, excl_x, excl_y, excl_r2)
+                or hasNearbyPoints(x, y, pts, grid_idx, gridCols, gridRows, cellSize, minDistanceSq)):
+            misses[cell] += 1
+            if misses[cell] >= max_attempts:
+                closed[cell] = True
             continue
-        
-        # Found valid candidate
-        points.append(candidate)
-        activeList.append(candidate)
-        insertIntoGrid(candidate)
-        found = True
-        print(f"  ✓ Found valid point at ({candidate['x']}, {candidate['y']}) after {i+1} attempts")
-        break
-    
-    if not found:
-        print(f"  ✗ Failed to find valid point after {maxAttempts} attempts")
-        print(f"    Rejections: bounds={rejection_reasons['bounds']}, excluded={rejection_reasons['excluded']}, nearby={rejection_reasons['nearby']}")
-        activeList.pop(randomIndex)
-    
-    print()
-    
-    if iteration > 20:  # Limit output
-        print("... stopping simulation ...")
-        break
-
-print(f"\nFinal result: {len(points)} points placed")
-print("Points:", [(p["x"], p["y"]) for p in points])
 
+        gridX = int(x / cellSize)
+        gridY = int(y / cellSize)
+        pts[n_pts, 0] = x
+        pts[n_pts, 1] = y
+        grid_idx[gridY * gridCols + gridX] = n_pts
+        n_pts += 1
+        closed[gridY * gridCols + gridX] = True
+
+        # Close neighbors whose farthest corner is inside the new point's disk
+        for k in range(NEIGHBOR_OFFSETS.shape[0]):
+            checkY = gridY + NEIGHBOR_OFFSETS[k, 0]
+            checkX = gridX + NEIGHBOR_OFFSETS[k, 1]
+            if 0 <= checkY < gridRows and 0 <= checkX < gridCols:
+                fx = max(abs(checkX * cellSize - x), abs((checkX + 1) * cellSize - x))
+                fy = max(abs(checkY * cellSize - y), abs((checkY + 1) * cellSize - y))
+                if fx * fx + fy * fy < minDistanceSq:
+                    closed[checkY * gridCols + checkX] = True
+
+    return pts[:n_pts]
+
+excl_x = np.array([z["x"] for z in excludedZones], dtype=np.float64)
+excl_y = np.array([z["y"] for z in excludedZones], dtype=np.float64)
+# Squared radii, so zone tests compare squared distances without a sqrt
+excl_r2 = np.array([z["radius"] * z["radius"] for z in excludedZones], dtype=np.float64)
+
+# Report lines, buffered and written once at the end
+log = []
+
+if sampler == "jones":
+    points = run_jones(seed, gridWidth, gridHeight, minDistance, targetCount, maxAttempts,
+                       excl_x, excl_y, excl_r2)
+else:
+    run_bridson = make_bridson_kernel(gridWidth, gridHeight, minDistance, maxAttempts)
+    points, trace = run_bridson(
+        seed, targetCount, excl_x, excl_y, excl_r2, maxIterations, trigTable, swapRemove,
+    )
+
+    if len(points) == 0:
+        raise SystemExit("Failed to find initial point outside excluded zones")
+
+    if verbose:
+        log.append(f"Initial point: ({int(points[0, 0])}, {int(points[0, 1])})")
+        log.append("")
+
+        for iteration, rec in enumerate(trace, start=1):
+            sx, sy = points[rec[TRACE_SELECTED]]
+            log.append(f"=== Iteration {iteration} ===")
+            log.append(f"Active list size: {rec[TRACE_ACTIVE]}, Points: {rec[TRACE_POINTS]}")
+            log.append(f"Selected point: ({int(sx)}, {int(sy)})")
+
+            if rec[TRACE_ATTEMPT] >= 0:
+                cx, cy = points[rec[TRACE_POINTS]]
+                log.append(f"  ✓ Found valid point at ({int(cx)}, {int(cy)}) after {rec[TRACE_ATTEMPT]+1} attempts")
+            else:
+                log.append(f"  ✗ Failed to find valid point after {maxAttempts} attempts")
+                log.append(f"    Rejections: bounds={rec[TRACE_BOUNDS]}, excluded={rec[TRACE_EXCLUDED]}, nearby={rec[TRACE_NEARBY]}")
+
+            log.append("")
+
+            if iteration >= maxIterations:
+                log.append("... stopping simulation ...")
+
+log.append("")
+log.append(f"Final result: {len(points)} points placed")
+log.append(f"Points: {[(int(x), int(y)) for x, y in points]}")
+
+# One write for the whole report
+sys.stdout.write("\n".join(log) + "\n")
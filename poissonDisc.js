@@ -133,6 +133,8 @@ function poissonDiscSampling(config, targetCount, excludedZones, rng) {
 function hasNearbyPoints(grid, point, minDistance, cellSize) {
   const gridX = Math.floor(point.x / cellSize);
   const gridY = Math.floor(point.y / cellSize);
+  // Compare squared distances to skip the sqrt per neighbor
+  const minDistanceSq = minDistance * minDistance;
 
   // Check surrounding cells (5x5 neighborhood)
   for (let dy = -2; dy <= 2; dy++) {
@@ -146,12 +148,10 @@ function hasNearbyPoints(grid, point, minDistance, cellSize) {
         grid[checkY][checkX] !== null
       ) {
         const existingPoint = grid[checkY][checkX];
-        const distance = Math.sqrt(
-          Math.pow(point.x - existingPoint.x, 2) +
-          Math.pow(point.y - existingPoint.y, 2)
-        );
+        const distX = point.x - existingPoint.x;
+        const distY = point.y - existingPoint.y;
 
-        if (distance < minDistance) {
+        if (distX * distX + distY * distY < minDistanceSq) {
           return true;
         }
       }
@@ -195,12 +195,10 @@ function isPointInBounds(point, config) {
  */
 function isInExcludedZone(point, excludedZones) {
   for (const zone of excludedZones) {
-    const distance = Math.sqrt(
-      Math.pow(point.x - zone.x, 2) +
-      Math.pow(point.y - zone.y, 2)
-    );
+    const distX = point.x - zone.x;
+    const distY = point.y - zone.y;
 
-    if (distance < zone.radius) {
+    if (distX * distX + distY * distY < zone.radius * zone.radius) {
       return true;
     }
   }